@@ -2,9 +2,90 @@
 Create a demo video with simulated license plates for testing
 """
 
+import queue
+import threading
+
 import cv2
 import numpy as np
 
+# Try to import PyNvVideoCodec for GPU-accelerated H.264 encoding (NVENC)
+try:
+    import PyNvVideoCodec as pnvc
+    PNVC_AVAILABLE = True
+except ImportError:
+    PNVC_AVAILABLE = False
+
+
+class NvencVideoWriter:
+    """
+    Minimal cv2.VideoWriter-compatible wrapper around PyNvVideoCodec.
+
+    Encodes frames with the dedicated NVENC hardware block instead of the
+    CPU mp4v encoder, freeing the CPU for frame generation. Note: the
+    output is an H.264 elementary stream (playable directly, or muxable
+    into a container with ffmpeg).
+    """
+
+    def __init__(self, output_path, width, height, fps):
+        self._encoder = pnvc.CreateEncoder(width, height, 'NV12', False,
+                                           fps=fps, codec='h264', preset='P4')
+        self._file = open(output_path, 'wb')
+        self._height = height
+        # Reused NV12 surface (Y plane + interleaved UV half-plane)
+        self._nv12 = np.empty((height * 3 // 2, width), dtype=np.uint8)
+
+    def write(self, frame):
+        # OpenCV has no BGR->NV12 conversion code (forward conversions
+        # only cover the planar I420/YV12 layouts), so convert to I420
+        # and repack the planar U/V halves into NV12's interleaved UV
+        # plane. The flat 0::2/1::2 interleave matches because both
+        # layouts store chroma in row-major (h/2, w/2) order.
+        h = self._height
+        i420 = cv2.cvtColor(frame, cv2.COLOR_BGR2YUV_I420)
+        nv12 = self._nv12
+        nv12[:h] = i420[:h]
+        uv = nv12[h:].reshape(-1)
+        quarter = h // 4
+        uv[0::2] = i420[h:h + quarter].reshape(-1)
+        uv[1::2] = i420[h + quarter:].reshape(-1)
+        bitstream = self._encoder.Encode(nv12)
+        if bitstream:
+            self._file.write(bytearray(bitstream))
+
+    def release(self):
+        # Flush any frames still buffered in the encoder
+        try:
+            bitstream = self._encoder.EndEncode()
+            if bitstream:
+                self._file.write(bytearray(bitstream))
+        finally:
+            self._file.close()
+
+
+def create_video_writer(output_path, width, height, fps):
+    """
+    Create the fastest available video writer.
+
+    Uses NVENC via PyNvVideoCodec when both the library and a CUDA device
+    are available, otherwise falls back to the CPU cv2.VideoWriter.
+
+    Returns:
+        Writer object with write(frame) and release() methods
+    """
+    if PNVC_AVAILABLE:
+        try:
+            if cv2.cuda.getCudaEnabledDeviceCount() > 0:
+                writer = NvencVideoWriter(output_path, width, height, fps)
+                print("Using GPU-accelerated encoding (NVENC)")
+                return writer
+        except Exception as e:
+            print(f"Warning: Could not initialize NVENC encoder: {e}")
+            print("Falling back to CPU encoding.")
+
+    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+    return cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+
+
 def create_demo_video(output_path='demo_video.mp4', duration_seconds=10, fps=30):
     """
     Create a simple demo video with license plate-like text
@@ -25,61 +106,186 @@ def create_demo_video(output_path='demo_video.mp4', duration_seconds=10, fps=30)
     print(f"Duration: {duration_seconds}s, FPS: {fps}, Total frames: {total_frames}")
     
     # Create video writer with proper resource management
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
-    
+    out = create_video_writer(output_path, width, height, fps)
+
+    # Build the gradient background once; every frame starts as a copy of it.
+    # A vectorized template avoids re-running a per-row Python loop for
+    # every frame (height rows x total_frames iterations).
+    color_vals = (50 + (np.arange(height) / height) * 100).astype(np.uint8)
+    gradient_template = np.empty((height, width, 3), dtype=np.uint8)
+    gradient_template[..., 0] = color_vals[:, None]
+    gradient_template[..., 1] = color_vals[:, None]
+    gradient_template[..., 2] = color_vals[:, None] + 20
+
+    # Plate position and size (constant for the whole video)
+    plate_x = 200
+    plate_y = 200
+    plate_width = 240
+    plate_height = 80
+
+    # Pre-render each plate once (white background, black border, centered
+    # text). The frame loop then just blits the cached image instead of
+    # re-rasterizing rectangles and text on every frame.
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    font_scale = 1.5
+    font_thickness = 3
+
+    plate_imgs = {}
+    for text in plates:
+        plate_img = np.full((plate_height, plate_width, 3), 255, dtype=np.uint8)
+        cv2.rectangle(plate_img, (0, 0), (plate_width - 1, plate_height - 1),
+                      (0, 0, 0), 2)
+
+        text_size = cv2.getTextSize(text, font, font_scale, font_thickness)[0]
+        text_x = (plate_width - text_size[0]) // 2
+        text_y = (plate_height + text_size[1]) // 2
+        cv2.putText(plate_img, text, (text_x, text_y),
+                    font, font_scale, (0, 0, 0), font_thickness)
+
+        plate_imgs[text] = plate_img
+
+    # Pre-render the frame-number overlay. The static "Frame: " prefix is
+    # baked into the gradient template; the changing part is blitted per
+    # frame from small pre-rendered character sprites instead of paying a
+    # cv2.putText rasterization on every frame. The gradient is constant
+    # along a row, so the sprites' backgrounds match at any x position.
+    overlay_scale = 0.7
+    overlay_thickness = 2
+    overlay_org = (10, 30)
+    overlay_prefix = "Frame: "
+
+    (prefix_width, text_height), baseline = cv2.getTextSize(
+        overlay_prefix, font, overlay_scale, overlay_thickness)
+    band_top = max(0, overlay_org[1] - text_height - 2)
+    band_bottom = overlay_org[1] + baseline
+
+    # Carve the sprite backgrounds before the prefix lands in the
+    # template: columns 10+ hold the left stroke of the 'F' once it is
+    # drawn, and every sprite copied from them would carry that glyph
+    # fragment
+    char_sprites = {}
+    for ch in '0123456789/':
+        char_width = cv2.getTextSize(ch, font, overlay_scale, overlay_thickness)[0][0]
+        sprite = gradient_template[band_top:band_bottom, :char_width].copy()
+        cv2.putText(sprite, ch, (0, overlay_org[1] - band_top),
+                    font, overlay_scale, (255, 255, 255), overlay_thickness)
+        char_sprites[ch] = sprite
+
+    cv2.putText(gradient_template, overlay_prefix, overlay_org,
+                font, overlay_scale, (255, 255, 255), overlay_thickness)
+
+    # Encode on a background thread so frame generation and encoding
+    # overlap instead of running serially. The bounded queue provides
+    # backpressure if the encoder falls behind. A pool of preallocated
+    # buffers is recycled between the two threads, so steady-state frame
+    # generation performs no allocations at all.
+    frame_queue = queue.Queue(maxsize=8)
+    buffer_pool = queue.Queue()
+    for _ in range(frame_queue.maxsize + 2):
+        buffer_pool.put(np.empty((height, width, 3), dtype=np.uint8))
+
+    # A write() failure on the encoder thread must reach the producer:
+    # a silently dead writer stops draining the queue and returning
+    # buffers, which would leave the producer blocked forever on the
+    # bounded queues below.
+    encode_error = []
+
+    def encode_frames():
+        while True:
+            queued_frame = frame_queue.get()
+            if queued_frame is None:
+                break
+            try:
+                out.write(queued_frame)
+            except Exception as e:
+                encode_error.append(e)
+                break
+            # Return the buffer to the pool for reuse
+            buffer_pool.put(queued_frame)
+
+    writer_thread = threading.Thread(target=encode_frames, daemon=True)
+    writer_thread.start()
+
+    def _writer_died():
+        raise RuntimeError('Encoder thread died') from \
+            (encode_error[0] if encode_error else None)
+
+    def _next_buffer():
+        # Pool get that notices a dead encoder thread instead of
+        # waiting forever for a buffer it will never return
+        while True:
+            try:
+                return buffer_pool.get(timeout=1.0)
+            except queue.Empty:
+                if not writer_thread.is_alive():
+                    _writer_died()
+
+    def _hand_off(frame):
+        # Likewise for the bounded frame queue on the put side
+        while True:
+            try:
+                frame_queue.put(frame, timeout=1.0)
+                return
+            except queue.Full:
+                if not writer_thread.is_alive():
+                    _writer_died()
+
+    # Hoist the per-iteration module lookup out of the frame loop; the
+    # earlier plate/overlay caching already removed the cv2 calls from
+    # the loop
+    _copyto = np.copyto
+
+    # Precompute the plate schedule: the plate only changes every fps*2
+    # frames, so iterate over (start, end, plate) segments and hoist the
+    # plate selection and image lookup out of the per-frame loop entirely.
+    segment_len = fps * 2
+    num_segments = (total_frames + segment_len - 1) // segment_len
+    segments = [(i * segment_len,
+                 min((i + 1) * segment_len, total_frames),
+                 plates[i % len(plates)])
+                for i in range(num_segments)]
+
     try:
-        for frame_num in range(total_frames):
-            # Create a frame with a gradient background
-            frame = np.zeros((height, width, 3), dtype=np.uint8)
-            
-            # Add gradient
-            for i in range(height):
-                color_val = int(50 + (i / height) * 100)
-                frame[i, :] = [color_val, color_val, color_val + 20]
-            
-            # Select plate based on frame number
-            plate_idx = (frame_num // (fps * 2)) % len(plates)
-            plate_text = plates[plate_idx]
-            
-            # Draw a white rectangle (simulated license plate)
-            plate_x = 200
-            plate_y = 200
-            plate_width = 240
-            plate_height = 80
-            
-            cv2.rectangle(frame, (plate_x, plate_y), 
-                         (plate_x + plate_width, plate_y + plate_height),
-                         (255, 255, 255), -1)
-            
-            # Add border
-            cv2.rectangle(frame, (plate_x, plate_y), 
-                         (plate_x + plate_width, plate_y + plate_height),
-                         (0, 0, 0), 2)
-            
-            # Add plate text
-            font = cv2.FONT_HERSHEY_SIMPLEX
-            font_scale = 1.5
-            font_thickness = 3
-            text_size = cv2.getTextSize(plate_text, font, font_scale, font_thickness)[0]
-            
-            # Center the text
-            text_x = plate_x + (plate_width - text_size[0]) // 2
-            text_y = plate_y + (plate_height + text_size[1]) // 2
-            
-            cv2.putText(frame, plate_text, (text_x, text_y),
-                       font, font_scale, (0, 0, 0), font_thickness)
-            
-            # Add frame number
-            cv2.putText(frame, f"Frame: {frame_num + 1}/{total_frames}", (10, 30),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-            
-            # Write frame
-            out.write(frame)
+        for seg_start, seg_end, plate_text in segments:
+            plate_img = plate_imgs[plate_text]
+
+            for frame_num in range(seg_start, seg_end):
+                # Reuse a pooled buffer, starting from the gradient background
+                frame = _next_buffer()
+                _copyto(frame, gradient_template)
+
+                # Blit the pre-rendered plate (simulated license plate)
+                frame[plate_y:plate_y + plate_height,
+                      plate_x:plate_x + plate_width] = plate_img
+
+                # Add frame number by blitting pre-rendered character sprites
+                # (the "Frame: " prefix is already part of the template)
+                x = overlay_org[0] + prefix_width
+                for ch in f"{frame_num + 1}/{total_frames}":
+                    sprite = char_sprites[ch]
+                    frame[band_top:band_bottom, x:x + sprite.shape[1]] = sprite
+                    x += sprite.shape[1]
+
+                # Hand the frame to the encoder thread
+                _hand_off(frame)
     finally:
+        # Signal end of stream, wait for the encoder to drain the queue
+        # (skip the sentinel if the encoder already died - nothing is
+        # draining the queue, and join would return immediately anyway)
+        while writer_thread.is_alive():
+            try:
+                frame_queue.put(None, timeout=1.0)
+                break
+            except queue.Full:
+                continue
+        writer_thread.join()
+
         # Release resources
         out.release()
-    
+
+    if encode_error:
+        raise RuntimeError('Video encoding failed') from encode_error[0]
+
     print(f"✅ Demo video created successfully: {output_path}")
     print(f"License plates in video: {', '.join(plates)}")
 
@@ -3,104 +3,92 @@ Test script for the multi-agent AI system
 Tests core functionality without requiring camera or GUI
 """
 
+import atexit
 import sys
 import csv
 import os
 from datetime import datetime
 
-# Test imports
-print("Testing imports...")
-try:
-    import pandas as pd
-    import numpy as np
-    print("✓ pandas and numpy imported successfully")
-except ImportError as e:
-    print(f"✗ Error importing pandas/numpy: {e}")
-    sys.exit(1)
+import pandas as pd
+import numpy as np
 
-# Test Agent 2: Access Control Agent
-print("\nTesting Agent 2: Access Control Agent...")
 
 class AccessControlAgentTest:
     """Simplified version for testing"""
-    
+
     def __init__(self, whitelist_file="authorized_plates.csv", log_file="test_access_log.csv"):
         self.whitelist_file = whitelist_file
         self.log_file = log_file
         self.authorized_plates = self.load_whitelist()
         self.initialize_log()
-    
+
+        # One long-lived buffered handle instead of an open/close
+        # syscall pair per logged plate; flushed every 64 rows and
+        # closed via atexit (or close_log) at the end
+        self._log_fh = open(self.log_file, 'a', newline='', buffering=1 << 16)
+        self._log_writer = csv.writer(self._log_fh)
+        self._n_since_flush = 0
+        atexit.register(self.close_log)
+
     def load_whitelist(self):
-        authorized = set()
         if os.path.exists(self.whitelist_file):
-            with open(self.whitelist_file, 'r') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    plate = row['plate_number'].strip().upper()
-                    authorized.add(plate)
-        return authorized
-    
+            # Plain csv.reader skips DictReader's dict-per-row
+            # construction; the header is consumed once up front
+            with open(self.whitelist_file, 'r', newline='') as f:
+                reader = csv.reader(f)
+                next(reader, None)
+                return {row[0].strip().upper() for row in reader if row}
+        return set()
+
     def initialize_log(self):
         if not os.path.exists(self.log_file):
             with open(self.log_file, 'w', newline='') as f:
                 writer = csv.writer(f)
                 writer.writerow(['timestamp', 'plate_number', 'status'])
-    
+
     def check_authorization(self, plate_number):
         return plate_number in self.authorized_plates
-    
+
     def log_access_attempt(self, plate_number, status):
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        with open(self.log_file, 'a', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow([timestamp, plate_number, status])
-    
+        # isoformat emits the same "YYYY-MM-DD HH:MM:SS" shape straight
+        # from C, without strftime's format-string interpreter
+        timestamp = datetime.now().isoformat(sep=' ', timespec='seconds')
+        self._log_writer.writerow([timestamp, plate_number, status])
+        self._n_since_flush += 1
+        if self._n_since_flush >= 64:
+            self._log_fh.flush()
+            self._n_since_flush = 0
+
+    def close_log(self):
+        if self._log_fh is not None:
+            self._log_fh.close()
+            self._log_fh = None
+            self._log_writer = None
+
     def process_plate(self, plate_number):
         is_authorized = self.check_authorization(plate_number)
         status = "ALLOW" if is_authorized else "DENY"
         self.log_access_attempt(plate_number, status)
         return {"decision": status, "plate_number": plate_number}
 
-# Test Agent 2
-try:
-    agent2 = AccessControlAgentTest()
-    print(f"✓ Agent 2 initialized with {len(agent2.authorized_plates)} authorized plates")
-    
-    # Test authorized plate
-    result = agent2.process_plate("ABC123")
-    assert result['decision'] == "ALLOW", "Expected ALLOW for ABC123"
-    print(f"✓ Test 1 passed: ABC123 -> {result['decision']}")
-    
-    # Test unauthorized plate
-    result = agent2.process_plate("INVALID999")
-    assert result['decision'] == "DENY", "Expected DENY for INVALID999"
-    print(f"✓ Test 2 passed: INVALID999 -> {result['decision']}")
-    
-    # Test another authorized plate
-    result = agent2.process_plate("XYZ789")
-    assert result['decision'] == "ALLOW", "Expected ALLOW for XYZ789"
-    print(f"✓ Test 3 passed: XYZ789 -> {result['decision']}")
-    
-except Exception as e:
-    print(f"✗ Agent 2 test failed: {e}")
-    sys.exit(1)
-
-# Test Agent 3: Data Analytics
-print("\nTesting Agent 3: Data Analytics Agent...")
 
 class DataAnalyticsAgentTest:
     """Simplified version for testing"""
-    
+
     def __init__(self, log_file="test_access_log.csv"):
         self.log_file = log_file
-    
+
     def load_data(self):
         if os.path.exists(self.log_file):
-            df = pd.read_csv(self.log_file)
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            return df
+            # Parse timestamps inside the C reader instead of a second
+            # pass, and store status as category codes rather than one
+            # Python string object per row
+            return pd.read_csv(self.log_file,
+                               parse_dates=['timestamp'],
+                               dtype={'status': 'category',
+                                      'plate_number': 'string'})
         return pd.DataFrame(columns=['timestamp', 'plate_number', 'status'])
-    
+
     def calculate_kpis(self, df):
         if df.empty:
             return {
@@ -109,12 +97,15 @@ class DataAnalyticsAgentTest:
                 'total_denied': 0,
                 'allow_rate': 0.0
             }
-        
-        total_entries = len(df)
-        total_allowed = len(df[df['status'] == 'ALLOW'])
-        total_denied = len(df[df['status'] == 'DENY'])
+
+        # One value_counts pass instead of three scans (two of which
+        # would allocate boolean-mask DataFrames)
+        counts = df['status'].value_counts()
+        total_entries = int(counts.sum())
+        total_allowed = int(counts.get('ALLOW', 0))
+        total_denied = int(counts.get('DENY', 0))
         allow_rate = (total_allowed / total_entries * 100) if total_entries > 0 else 0
-        
+
         return {
             'total_entries': total_entries,
             'total_allowed': total_allowed,
@@ -122,15 +113,60 @@ class DataAnalyticsAgentTest:
             'allow_rate': allow_rate
         }
 
-# Test Agent 3
-try:
+    def kpis_by_hour(self, df):
+        """
+        Hourly ALLOW/DENY counts in a single groupby pass.
+
+        The grouping runs on the status column's category codes, and
+        one hash-based size() replaces a boolean-mask filter per
+        status per hour; further breakdowns just add groupers.
+        """
+        if df.empty:
+            return pd.DataFrame()
+
+        return (df.groupby([df['timestamp'].dt.hour.rename('hour'), 'status'],
+                           observed=True, sort=False)
+                  .size()
+                  .unstack('status', fill_value=0))
+
+
+def test_agent2():
+    """Exercise the Access Control agent against the sample whitelist"""
+    print("\nTesting Agent 2: Access Control Agent...")
+
+    agent2 = AccessControlAgentTest()
+    print(f"✓ Agent 2 initialized with {len(agent2.authorized_plates)} authorized plates")
+
+    # Test authorized plate
+    result = agent2.process_plate("ABC123")
+    assert result['decision'] == "ALLOW", "Expected ALLOW for ABC123"
+    print(f"✓ Test 1 passed: ABC123 -> {result['decision']}")
+
+    # Test unauthorized plate
+    result = agent2.process_plate("INVALID999")
+    assert result['decision'] == "DENY", "Expected DENY for INVALID999"
+    print(f"✓ Test 2 passed: INVALID999 -> {result['decision']}")
+
+    # Test another authorized plate
+    result = agent2.process_plate("XYZ789")
+    assert result['decision'] == "ALLOW", "Expected ALLOW for XYZ789"
+    print(f"✓ Test 3 passed: XYZ789 -> {result['decision']}")
+
+    # Flush the buffered log so the analytics agent sees the rows
+    agent2.close_log()
+
+
+def test_agent3():
+    """Exercise the Data Analytics agent over the log test_agent2 wrote"""
+    print("\nTesting Agent 3: Data Analytics Agent...")
+
     agent3 = DataAnalyticsAgentTest()
     print("✓ Agent 3 initialized")
-    
+
     # Load data
     df = agent3.load_data()
     print(f"✓ Loaded {len(df)} log entries")
-    
+
     # Calculate KPIs
     kpis = agent3.calculate_kpis(df)
     print(f"✓ KPIs calculated:")
@@ -138,31 +174,58 @@ try:
     print(f"  - Total allowed: {kpis['total_allowed']}")
     print(f"  - Total denied: {kpis['total_denied']}")
     print(f"  - Allow rate: {kpis['allow_rate']:.1f}%")
-    
+
     assert kpis['total_entries'] == 3, "Expected 3 total entries"
     assert kpis['total_allowed'] == 2, "Expected 2 allowed entries"
     assert kpis['total_denied'] == 1, "Expected 1 denied entry"
-    
+
+    # Hourly breakdown: all three attempts were logged moments ago, so
+    # they land in a single hour bucket with the same ALLOW/DENY split
+    hourly = agent3.kpis_by_hour(df)
+    assert len(hourly) == 1, "Expected a single active hour"
+    hour = int(df['timestamp'].dt.hour.iloc[0])
+    assert hourly.loc[hour, 'ALLOW'] == 2, "Expected 2 ALLOW in the active hour"
+    assert hourly.loc[hour, 'DENY'] == 1, "Expected 1 DENY in the active hour"
+    print(f"✓ Hourly breakdown verified (hour {hour}: 2 ALLOW / 1 DENY)")
+
     print("✓ All Agent 3 tests passed")
-    
-except Exception as e:
-    print(f"✗ Agent 3 test failed: {e}")
-    import traceback
-    traceback.print_exc()
-    sys.exit(1)
-
-# Cleanup test log
-try:
-    if os.path.exists("test_access_log.csv"):
-        os.remove("test_access_log.csv")
-    print("\n✓ Test cleanup completed")
-except:
-    pass
-
-print("\n" + "="*50)
-print("ALL TESTS PASSED! ✓")
-print("="*50)
-print("\nThe multi-agent system is ready to use!")
-print("\nTo run the full system:")
-print("  Terminal 1: python main.py")
-print("  Terminal 2: streamlit run dashboard.py")
+
+
+def main():
+    print("Testing imports...")
+    print("✓ pandas and numpy imported successfully")
+
+    try:
+        test_agent2()
+    except Exception as e:
+        print(f"✗ Agent 2 test failed: {e}")
+        return 1
+
+    try:
+        test_agent3()
+    except Exception as e:
+        print(f"✗ Agent 3 test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    # Cleanup test log
+    try:
+        if os.path.exists("test_access_log.csv"):
+            os.remove("test_access_log.csv")
+        print("\n✓ Test cleanup completed")
+    except:
+        pass
+
+    print("\n" + "="*50)
+    print("ALL TESTS PASSED! ✓")
+    print("="*50)
+    print("\nThe multi-agent system is ready to use!")
+    print("\nTo run the full system:")
+    print("  Terminal 1: python main.py")
+    print("  Terminal 2: streamlit run dashboard.py")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -92,27 +92,32 @@ def write_license_plates_to_excel(results, output_path):
     # Track unique license plates and their data
     license_plate_data = {}
     
-    # Process results to extract unique license plates
-    for frame_nmr in results.keys():
-        for car_id in results[frame_nmr].keys():
-            if 'car' in results[frame_nmr][car_id].keys() and \
-               'license_plate' in results[frame_nmr][car_id].keys() and \
-               'text' in results[frame_nmr][car_id]['license_plate'].keys():
-                
-                plate_text = results[frame_nmr][car_id]['license_plate']['text']
-                confidence = results[frame_nmr][car_id]['license_plate']['text_score']
-                
-                if plate_text not in license_plate_data:
-                    license_plate_data[plate_text] = {
-                        'first_frame': frame_nmr,
-                        'last_frame': frame_nmr,
-                        'detections': 1,
-                        'confidences': [confidence]
-                    }
-                else:
-                    license_plate_data[plate_text]['last_frame'] = frame_nmr
-                    license_plate_data[plate_text]['detections'] += 1
-                    license_plate_data[plate_text]['confidences'].append(confidence)
+    # Process results to extract unique license plates. Each nesting
+    # level is bound once with .get() instead of three 'in ...keys()'
+    # membership chains (each allocating a fresh KeysView) followed by
+    # re-indexing the same dicts.
+    for frame_nmr, cars in results.items():
+        for entry in cars.values():
+            if 'car' not in entry:
+                continue
+            license_plate = entry.get('license_plate')
+            if not license_plate or 'text' not in license_plate:
+                continue
+
+            plate_text = license_plate['text']
+            confidence = license_plate['text_score']
+
+            if plate_text not in license_plate_data:
+                license_plate_data[plate_text] = {
+                    'first_frame': frame_nmr,
+                    'last_frame': frame_nmr,
+                    'detections': 1,
+                    'confidences': [confidence]
+                }
+            else:
+                license_plate_data[plate_text]['last_frame'] = frame_nmr
+                license_plate_data[plate_text]['detections'] += 1
+                license_plate_data[plate_text]['confidences'].append(confidence)
     
     # Write data rows
     row_num = 2
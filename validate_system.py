@@ -3,21 +3,34 @@ Basic validation script - checks code structure without external dependencies
 """
 
 import ast
+import os
+import re
 import sys
+from functools import lru_cache
+
+@lru_cache(maxsize=64)
+def _parse_structure(filepath, mtime_ns):
+    """Parse a file once per (path, mtime); repeat validations hit the cache."""
+    with open(filepath, 'r') as f:
+        code = f.read()
+
+    tree = ast.parse(code)
+
+    # Collect classes and functions in one walk instead of two
+    classes, functions = [], []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef):
+            classes.append(node.name)
+        elif isinstance(node, ast.FunctionDef):
+            functions.append(node.name)
+
+    return classes, functions
 
 def validate_python_file(filepath):
     """Validate Python file has correct syntax and structure"""
     try:
-        with open(filepath, 'r') as f:
-            code = f.read()
-        
-        # Parse the code
-        tree = ast.parse(code)
-        
-        # Count classes and functions
-        classes = [node.name for node in ast.walk(tree) if isinstance(node, ast.ClassDef)]
-        functions = [node.name for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)]
-        
+        classes, functions = _parse_structure(filepath,
+                                              os.stat(filepath).st_mtime_ns)
         return True, classes, functions
     except SyntaxError as e:
         return False, str(e), []
@@ -82,11 +95,16 @@ try:
         requirements = [line.strip() for line in f if line.strip() and not line.startswith('#')]
     
     required_packages = ['opencv-python', 'easyocr', 'pandas', 'streamlit', 'ultralytics']
-    
+
+    # Normalize each line to its project name (strip version pins,
+    # extras, markers) so checks are exact O(1) set lookups rather than
+    # substring scans that a name like pandas-datareader could satisfy
+    have = {re.split(r'[<>=;!\[ ]', line, 1)[0].lower().replace('_', '-')
+            for line in requirements}
+
     for pkg in required_packages:
-        found = any(pkg in req for req in requirements)
-        assert found, f"Missing required package: {pkg}"
-    
+        assert pkg.lower() in have, f"Missing required package: {pkg}"
+
     print(f"   ✓ File valid")
     print(f"   ✓ Found {len(requirements)} dependencies")
     print(f"   ✓ All required packages present")